@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Data Store - Schema validation, versioned storage and repair for JSON data files
+
+Records are validated once, when they are written. Saves are atomic and
+stamped with a schema version and a checksum of the raw records text, so a
+file that passes the checksum on load is trusted without re-checking every item.
+"""
+
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple
+
+SCHEMA_VERSION = 1
+
+# Field name -> accepted types. Fields not listed here are allowed as-is.
+TODO_SCHEMA = {
+    "required": {"id": (int,), "title": (str,)},
+    "optional": {
+        "category": (str,),
+        "priority": (str,),
+        "status": (str,),
+        "due_date": (str, type(None)),
+        "project": (str, type(None)),
+        "assignee": (str, type(None)),
+        "tags": (list,),
+        "description": (str, type(None)),
+        "created_at": (str,),
+        "updated_at": (str,),
+    },
+}
+
+JOURNAL_SCHEMA = {
+    "required": {"id": (int,), "content": (str,)},
+    "optional": {
+        "category": (str,),
+        "mood": (str, type(None)),
+        "tags": (list,),
+        "timestamp": (str,),
+    },
+}
+
+
+def validate_record(record, schema: Dict) -> Optional[str]:
+    """Return a description of the first schema violation, or None if valid"""
+    if not isinstance(record, dict):
+        return f"expected an object, got {type(record).__name__}"
+
+    for field, types in schema["required"].items():
+        if field not in record:
+            return f"missing required field '{field}'"
+        # bool is a subclass of int, but never a valid id
+        if isinstance(record[field], bool) or not isinstance(record[field], types):
+            return f"field '{field}' has invalid type {type(record[field]).__name__}"
+
+    for field, types in schema["optional"].items():
+        if field in record and not isinstance(record[field], types):
+            return f"field '{field}' has invalid type {type(record[field]).__name__}"
+
+    tags = record.get("tags")
+    if tags is not None and not all(isinstance(tag, str) for tag in tags):
+        return "field 'tags' must contain only strings"
+
+    return None
+
+
+class StoreError(Exception):
+    """Raised when a data file cannot be loaded without risking data loss"""
+
+
+# save_store writes the envelope in this fixed layout, with the records last
+_ITEMS_MARKER = '\n  "items": '
+_ENVELOPE_END = "\n}"
+
+
+def _checksum(items_text: str) -> str:
+    """Compute the checksum of the records text as written to disk"""
+    return "sha256:" + hashlib.sha256(items_text.encode("utf-8")).hexdigest()
+
+
+def _items_text(text: str) -> Optional[str]:
+    """Slice the raw records text out of a file written by save_store"""
+    start = text.find(_ITEMS_MARKER)
+    if start == -1 or not text.endswith(_ENVELOPE_END):
+        return None
+    return text[start + len(_ITEMS_MARKER):-len(_ENVELOPE_END)]
+
+
+def _checksum_ok(data: Dict, text: str) -> bool:
+    """Check the stamped checksum against the raw records text"""
+    items_text = _items_text(text)
+    return items_text is not None and data.get("checksum") == _checksum(items_text)
+
+
+def _unwrap(data, data_file: Path) -> List:
+    """Return the record list of a parsed file, refusing anything unsupported"""
+    if isinstance(data, dict):
+        version = data.get("schema_version")
+        if version != SCHEMA_VERSION:
+            raise StoreError(f"{data_file} has unsupported schema version {version!r}")
+        data = data.get("items")
+    if not isinstance(data, list):
+        raise StoreError(f"Invalid data format in {data_file}; run 'fsck --repair' to salvage records")
+    return data
+
+
+def _read(data_file: Path) -> Tuple[str, object]:
+    """Read a data file, returning its text and parsed content"""
+    with open(data_file, 'r', encoding='utf-8') as f:
+        text = f.read()
+    try:
+        return text, json.loads(text)
+    except json.JSONDecodeError as e:
+        raise StoreError(f"Could not parse {data_file} ({e}); run 'fsck --repair' to salvage records")
+
+
+def load_store(data_file: Path, schema: Dict) -> Tuple[List[Dict], int]:
+    """Load records and the number of invalid ones dropped, validating only untrusted files"""
+    if not data_file.exists():
+        return [], 0
+
+    text, data = _read(data_file)
+    items = _unwrap(data, data_file)
+
+    if isinstance(data, dict):
+        if _checksum_ok(data, text):
+            return items, 0
+        print(f"Warning: Checksum mismatch in {data_file}, validating records", file=sys.stderr)
+
+    valid_items = [item for item in items if validate_record(item, schema) is None]
+    dropped = len(items) - len(valid_items)
+    if dropped:
+        print(f"Warning: Filtered {dropped} invalid items from {data_file} "
+              f"(the original is backed up on the next save)", file=sys.stderr)
+    return valid_items, dropped
+
+
+def save_store(data_file: Path, items: List[Dict], backup: bool = False) -> Optional[Path]:
+    """Atomically write validated records stamped with schema version and checksum
+
+    When backup is set, the current file is copied aside first and the
+    backup path is returned.
+    """
+    items_text = json.dumps(items, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+    data_file.parent.mkdir(parents=True, exist_ok=True)
+    backup_file = _backup(data_file) if backup and data_file.exists() else None
+
+    tmp_file = data_file.with_name(data_file.name + ".tmp")
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        # Same layout as json.dump(..., indent=2) of the envelope, without serializing twice
+        f.write("{\n")
+        f.write(f'  "schema_version": {SCHEMA_VERSION},\n')
+        f.write(f'  "checksum": "{_checksum(items_text)}",')
+        f.write(_ITEMS_MARKER + items_text + _ENVELOPE_END)
+    os.replace(tmp_file, data_file)
+    return backup_file
+
+
+def read_items(data_file: Path) -> List:
+    """Read the raw record list from a versioned or unversioned file"""
+    return _unwrap(_read(data_file)[1], data_file)
+
+
+def _backup(data_file: Path) -> Path:
+    """Copy a data file aside, never overwriting an earlier backup"""
+    backup = data_file.with_name(data_file.name + ".bak")
+    n = 1
+    while backup.exists():
+        backup = data_file.with_name(f"{data_file.name}.bak.{n}")
+        n += 1
+    backup.write_bytes(data_file.read_bytes())
+    return backup
+
+
+def _salvage(text: str, schema: Dict) -> Tuple[List[Dict], int, int]:
+    """Decode records one object at a time, skipping over damaged regions
+
+    Returns the valid records, the number of well-formed but invalid records,
+    and the number of damaged records that could not be decoded.
+    """
+    decoder = json.JSONDecoder()
+    salvaged = []
+    invalid = 0
+    damaged = 0
+    pos = text.find("{")
+
+    while pos != -1:
+        try:
+            obj, end = decoder.raw_decode(text, pos)
+        except json.JSONDecodeError:
+            # A record starts right after '[' or ','; count it as lost
+            if text[:pos].rstrip()[-1:] in ("[", ","):
+                damaged += 1
+            pos = text.find("{", pos + 1)
+            continue
+
+        if isinstance(obj, dict) and "items" in obj and "schema_version" in obj:
+            # Intact envelope: descend into it rather than consuming it whole
+            pos = text.find("{", pos + 1)
+            continue
+
+        if validate_record(obj, schema) is None:
+            salvaged.append(obj)
+        else:
+            invalid += 1
+        pos = text.find("{", end)
+
+    return salvaged, invalid, damaged
+
+
+def fsck(data_file: Path, schema: Dict, repair: bool = False) -> Dict:
+    """Check a data file and optionally rewrite it with only valid records"""
+    report = {"file": str(data_file), "exists": data_file.exists(),
+              "schema_version": None, "checksum_ok": False, "needs_upgrade": False}
+    if not report["exists"]:
+        report["ok"] = True
+        return report
+
+    with open(data_file, 'r', encoding='utf-8') as f:
+        text = f.read()
+
+    try:
+        data = json.loads(text)
+        report["parse_ok"] = True
+    except json.JSONDecodeError as e:
+        data = None
+        report["parse_ok"] = False
+        report["parse_error"] = str(e)
+
+    if isinstance(data, dict):
+        items = data.get("items")
+        report["schema_version"] = data.get("schema_version")
+        report["checksum_ok"] = _checksum_ok(data, text)
+    elif isinstance(data, list):
+        # Unversioned file from an older release
+        items = data
+        report["needs_upgrade"] = True
+    else:
+        items = None
+
+    version = report["schema_version"]
+    if isinstance(version, int) and version > SCHEMA_VERSION:
+        # Written by a newer release: never rewrite it in an older format
+        report["ok"] = False
+        report["error"] = f"unsupported schema version {version}"
+        return report
+
+    if isinstance(items, list):
+        valid_items = [item for item in items if validate_record(item, schema) is None]
+        report["invalid"] = len(items) - len(valid_items)
+        report["damaged"] = 0
+    else:
+        valid_items, report["invalid"], report["damaged"] = _salvage(text, schema)
+    report["records"] = len(valid_items) + report["invalid"] + report["damaged"]
+
+    intact = report["needs_upgrade"] or (version == SCHEMA_VERSION and report["checksum_ok"])
+    report["ok"] = (report["parse_ok"] and intact
+                    and report["invalid"] == 0 and report["damaged"] == 0)
+
+    if repair and (not report["ok"] or report["needs_upgrade"]):
+        report["backup"] = str(save_store(data_file, valid_items, backup=True))
+        report["recovered"] = len(valid_items)
+        report["lost"] = report["invalid"] + report["damaged"]
+
+    return report
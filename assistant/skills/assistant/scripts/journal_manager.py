@@ -10,6 +10,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Optional
 
+from data_store import JOURNAL_SCHEMA, StoreError, fsck, load_store, save_store, validate_record
+
 
 class JournalManager:
     def __init__(self, data_file: str = "journals.json"):
@@ -19,30 +21,22 @@ class JournalManager:
 
     def _load_journals(self) -> List[Dict]:
         """Load journals from JSON file"""
-        if not self.data_file.exists():
-            return []
-
-        try:
-            with open(self.data_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                # Ensure we have a list and all items are dictionaries
-                if not isinstance(data, list):
-                    print(f"Warning: Invalid data format in {self.data_file}, starting fresh", file=sys.stderr)
-                    return []
-                # Filter out any non-dict items
-                valid_journals = [item for item in data if isinstance(item, dict)]
-                if len(valid_journals) != len(data):
-                    print(f"Warning: Filtered {len(data) - len(valid_journals)} invalid items from {self.data_file}", file=sys.stderr)
-                return valid_journals
-        except json.JSONDecodeError:
-            print(f"Warning: Could not parse {self.data_file}, starting fresh", file=sys.stderr)
-            return []
+        items, self._dropped = load_store(self.data_file, JOURNAL_SCHEMA)
+        return items
 
     def _save_journals(self):
         """Save journals to JSON file"""
-        self.data_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.data_file, 'w', encoding='utf-8') as f:
-            json.dump(self.journals, f, ensure_ascii=False, indent=2)
+        # Keep a copy of the original if loading dropped invalid records
+        backup = save_store(self.data_file, self.journals, backup=self._dropped > 0)
+        if backup:
+            print(f"Warning: Original data saved to {backup}", file=sys.stderr)
+        self._dropped = 0
+
+    def _validate(self, entry: Dict):
+        """Reject an entry that does not match the schema before it is stored"""
+        error = validate_record(entry, JOURNAL_SCHEMA)
+        if error:
+            raise ValueError(f"Invalid journal entry: {error}")
 
     def add_entry(self, content: str, category: str = "general",
                   mood: Optional[str] = None, tags: Optional[List[str]] = None) -> Dict:
@@ -55,6 +49,7 @@ class JournalManager:
             "tags": tags or [],
             "timestamp": datetime.now().isoformat()
         }
+        self._validate(entry)
         self.journals.append(entry)
         self._save_journals()
         return entry
@@ -84,9 +79,12 @@ class JournalManager:
         """Update a journal entry"""
         for entry in self.journals:
             if entry["id"] == entry_id:
+                updated = dict(entry)
                 for key, value in kwargs.items():
                     if value is not None:
-                        entry[key] = value
+                        updated[key] = value
+                self._validate(updated)
+                entry.update(updated)
                 self._save_journals()
                 return entry
         return None
@@ -116,15 +114,34 @@ def main():
         print("  update <id> [--content CONTENT] [--category CAT] [--mood MOOD] [--tags TAG1,TAG2]")
         print("  delete <id>")
         print("  search <keyword>")
+        print("  fsck [--repair]")
         sys.exit(1)
 
     # Get data file from environment or use default in .assistant directory
     default_file = os.path.join(".assistant", "journals.json")
     data_file = os.environ.get("JOURNAL_DATA_FILE", default_file)
-    manager = JournalManager(data_file)
-
     command = sys.argv[1]
 
+    # fsck inspects the raw file, so it must run before the manager loads it
+    if command == "fsck":
+        report = fsck(Path(data_file), JOURNAL_SCHEMA, repair="--repair" in sys.argv[2:])
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        # A repair that had to drop records still counts as a failure
+        if "recovered" in report:
+            failed = report["lost"] > 0
+        else:
+            failed = not report["ok"]
+        if failed:
+            sys.exit(1)
+        return
+
+    try:
+        manager = JournalManager(data_file)
+    except StoreError as e:
+        # Leave the file untouched so fsck --repair can still recover it
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
     if command == "add":
         if len(sys.argv) < 3:
             print("Error: content required", file=sys.stderr)
@@ -3,13 +3,15 @@
 Data Migration Script - Migrate old data files to .assistant directory
 """
 
-import json
 import os
 import shutil
 from pathlib import Path
+from typing import Dict
 
+from data_store import JOURNAL_SCHEMA, TODO_SCHEMA, StoreError, read_items, save_store, validate_record
 
-def migrate_file(old_path: str, new_path: str, file_type: str):
+
+def migrate_file(old_path: str, new_path: str, file_type: str, schema: Dict):
     """Migrate a data file from old location to new location"""
     old_file = Path(old_path)
     new_file = Path(new_path)
@@ -27,10 +29,18 @@ def migrate_file(old_path: str, new_path: str, file_type: str):
         response = input(f"Do you want to merge with {old_path}? (y/n): ")
         if response.lower() == 'y':
             # Load both files
-            with open(old_file, 'r', encoding='utf-8') as f:
-                old_data = json.load(f)
-            with open(new_file, 'r', encoding='utf-8') as f:
-                new_data = json.load(f)
+            try:
+                old_data = read_items(old_file)
+                new_data = read_items(new_file)
+            except StoreError as e:
+                print(f"✗ {e}")
+                return
+
+            # Refuse to merge records that would not survive the schema check
+            invalid = sum(1 for item in old_data + new_data if validate_record(item, schema) is not None)
+            if invalid:
+                print(f"✗ Found {invalid} invalid {file_type} records, run 'fsck --repair' on both files first")
+                return
 
             # Merge (new_data takes precedence for ID conflicts)
             old_ids = {item['id'] for item in old_data}
@@ -43,8 +53,7 @@ def migrate_file(old_path: str, new_path: str, file_type: str):
                     merged_data.append(item)
 
             # Save merged data
-            with open(new_file, 'w', encoding='utf-8') as f:
-                json.dump(merged_data, f, ensure_ascii=False, indent=2)
+            save_store(new_file, merged_data)
 
             print(f"✓ Merged {len(old_data)} old items with {len(new_data)} new items")
             print(f"  Total items: {len(merged_data)}")
@@ -79,14 +88,14 @@ def main():
     print("1. Migrating TODOs...")
     old_todo = os.environ.get("TODO_DATA_FILE", "todos.json")
     new_todo = ".assistant/todos.json"
-    migrate_file(old_todo, new_todo, "TODOs")
+    migrate_file(old_todo, new_todo, "TODOs", TODO_SCHEMA)
     print()
 
     # Migrate Journals
     print("2. Migrating Journals...")
     old_journal = os.environ.get("JOURNAL_DATA_FILE", "journals.json")
     new_journal = ".assistant/journals.json"
-    migrate_file(old_journal, new_journal, "journals")
+    migrate_file(old_journal, new_journal, "journals", JOURNAL_SCHEMA)
     print()
 
     print("=" * 60)
@@ -10,6 +10,8 @@ from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Optional
 
+from data_store import TODO_SCHEMA, StoreError, fsck, load_store, save_store, validate_record
+
 
 class TodoManager:
     def __init__(self, data_file: str = "todos.json"):
@@ -19,37 +21,28 @@ class TodoManager:
 
     def _load_todos(self) -> List[Dict]:
         """Load todos from JSON file"""
-        if not self.data_file.exists():
-            return []
-
-        try:
-            with open(self.data_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                # Ensure we have a list and all items are dictionaries
-                if not isinstance(data, list):
-                    print(f"Warning: Invalid data format in {self.data_file}, starting fresh", file=sys.stderr)
-                    return []
-                # Filter out any non-dict items
-                valid_todos = [item for item in data if isinstance(item, dict)]
-                if len(valid_todos) != len(data):
-                    print(f"Warning: Filtered {len(data) - len(valid_todos)} invalid items from {self.data_file}", file=sys.stderr)
-                return valid_todos
-        except json.JSONDecodeError:
-            print(f"Warning: Could not parse {self.data_file}, starting fresh", file=sys.stderr)
-            return []
+        items, self._dropped = load_store(self.data_file, TODO_SCHEMA)
+        return items
 
     def _save_todos(self):
         """Save todos to JSON file"""
-        self.data_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.data_file, 'w', encoding='utf-8') as f:
-            json.dump(self.todos, f, ensure_ascii=False, indent=2)
+        # Keep a copy of the original if loading dropped invalid records
+        backup = save_store(self.data_file, self.todos, backup=self._dropped > 0)
+        if backup:
+            print(f"Warning: Original data saved to {backup}", file=sys.stderr)
+        self._dropped = 0
+
+    def _validate(self, todo: Dict):
+        """Reject a TODO that does not match the schema before it is stored"""
+        error = validate_record(todo, TODO_SCHEMA)
+        if error:
+            raise ValueError(f"Invalid TODO: {error}")
 
     def _get_next_id(self) -> int:
-        """Get next available ID safely"""
-        valid_todos = [t for t in self.todos if isinstance(t, dict)]
-        if not valid_todos:
+        """Get next available ID"""
+        if not self.todos:
             return 1
-        return max(todo.get("id", 0) for todo in valid_todos) + 1
+        return max(todo["id"] for todo in self.todos) + 1
 
     def add_todo(self, title: str, category: str = "general",
                  priority: str = "medium", due_date: Optional[str] = None,
@@ -70,6 +63,7 @@ class TodoManager:
             "created_at": datetime.now().isoformat(),
             "updated_at": datetime.now().isoformat()
         }
+        self._validate(todo)
         self.todos.append(todo)
         self._save_todos()
         return todo
@@ -81,8 +75,7 @@ class TodoManager:
                    assignee: Optional[str] = None,
                    tags: Optional[List[str]] = None) -> List[Dict]:
         """List todos with optional filters"""
-        # Filter out any non-dict items that might have corrupted the data
-        result = [t for t in self.todos if isinstance(t, dict)]
+        result = self.todos
 
         if category:
             result = [t for t in result if t.get("category") == category]
@@ -109,11 +102,14 @@ class TodoManager:
     def update_todo(self, todo_id: int, **kwargs) -> Optional[Dict]:
         """Update a TODO item"""
         for todo in self.todos:
-            if isinstance(todo, dict) and todo.get("id") == todo_id:
+            if todo["id"] == todo_id:
+                updated = dict(todo)
                 for key, value in kwargs.items():
                     if value is not None:
-                        todo[key] = value
-                todo["updated_at"] = datetime.now().isoformat()
+                        updated[key] = value
+                updated["updated_at"] = datetime.now().isoformat()
+                self._validate(updated)
+                todo.update(updated)
                 self._save_todos()
                 return todo
         return None
@@ -121,7 +117,7 @@ class TodoManager:
     def delete_todo(self, todo_id: int) -> bool:
         """Delete a TODO item"""
         initial_len = len(self.todos)
-        self.todos = [t for t in self.todos if not (isinstance(t, dict) and t.get("id") == todo_id)]
+        self.todos = [t for t in self.todos if t["id"] != todo_id]
         if len(self.todos) < initial_len:
             self._save_todos()
             return True
@@ -130,8 +126,7 @@ class TodoManager:
     def search_todos(self, keyword: str) -> List[Dict]:
         """Search todos by keyword in title"""
         keyword_lower = keyword.lower()
-        valid_todos = [t for t in self.todos if isinstance(t, dict)]
-        return [t for t in valid_todos if keyword_lower in t.get("title", "").lower()]
+        return [t for t in self.todos if keyword_lower in t.get("title", "").lower()]
 
 
 def main():
@@ -147,15 +142,34 @@ def main():
         print("             [--project PROJ] [--assignee WHO] [--tags TAG1,TAG2] [--description DESC]")
         print("  delete <id>")
         print("  search <keyword>")
+        print("  fsck [--repair]")
         sys.exit(1)
 
     # Get data file from environment or use default in .assistant directory
     default_file = os.path.join(".assistant", "todos.json")
     data_file = os.environ.get("TODO_DATA_FILE", default_file)
-    manager = TodoManager(data_file)
-
     command = sys.argv[1]
 
+    # fsck inspects the raw file, so it must run before the manager loads it
+    if command == "fsck":
+        report = fsck(Path(data_file), TODO_SCHEMA, repair="--repair" in sys.argv[2:])
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        # A repair that had to drop records still counts as a failure
+        if "recovered" in report:
+            failed = report["lost"] > 0
+        else:
+            failed = not report["ok"]
+        if failed:
+            sys.exit(1)
+        return
+
+    try:
+        manager = TodoManager(data_file)
+    except StoreError as e:
+        # Leave the file untouched so fsck --repair can still recover it
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
     if command == "add":
         if len(sys.argv) < 3:
             print("Error: title required", file=sys.stderr)